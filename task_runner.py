@@ -17,72 +17,161 @@ from __future__ import annotations
 #It lets you use features from newer versions of Python before they’re the default.
 #Basically, it’s a “turn this new behavior on now” switch.
 
+import os
 import sys
 import json
 import time
+import atexit
+import pickle
+import asyncio
 import traceback
 import functools
-from datetime import datetime
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Callable, Dict
 
+try:
+    # Optional: streaming JSON parser, only worth it for large configs.
+    import ijson
+except ImportError:
+    ijson = None
+
+# ijson reports parse errors as ijson.JSONError (not a ValueError subclass),
+# so bad input must be caught under either parser.
+_JSON_ERRORS = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
+
 # --------------------------------------------------------------------------------------
 # Paths & logging setup (relative to this file)
 # --------------------------------------------------------------------------------------
 
-SCRIPT_DIR = Path(__file__).resolve().parent
-LOG_DIR = SCRIPT_DIR / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
-LOG_FILE = LOG_DIR / "runner.log"
+@functools.lru_cache(maxsize=1)
+def _paths() -> tuple[Path, Path, Path, Path]:
+    """
+    Resolve script-relative paths and ensure the log directory exists.
+    Done lazily (and once) rather than at import: resolve() does a realpath
+    syscall and mkdir a stat, which tools that merely import this module to
+    introspect TASKS shouldn't have to pay.
+    Returns (script_dir, log_dir, log_file, config_path).
+    """
+    script_dir = Path(__file__).resolve().parent
+    log_dir = script_dir / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    return script_dir, log_dir, log_dir / "runner.log", script_dir / "tasks.json"
+
+# Per-task progress prints (START/Retrying) are feedback for a human watching
+# the run; under cron or a pipe they just add a stdout write per task. Opt in
+# explicitly with TASKRUNNER_VERBOSE=1. The log file always gets every line.
+_VERBOSE = os.environ.get("TASKRUNNER_VERBOSE") == "1"
+
+# Long-lived log fd + bytearray buffer: writing through a TextIOWrapper pays
+# its lock and incremental-encoder machinery on every line. Instead we encode
+# each line once, accumulate into a buffer, and flush with a single os.write
+# when the buffer fills (or at exit). The fd is opened lazily on first use.
+_LOG_FD = None
+_LOG_BUF = bytearray()
+_LOG_FLUSH_AT = 1 << 16
+
+
+def _flush_log() -> None:
+    if _LOG_BUF and _LOG_FD is not None:
+        os.write(_LOG_FD, bytes(_LOG_BUF))
+        del _LOG_BUF[:]
+
+
+def _close_log() -> None:
+    _flush_log()
+    os.close(_LOG_FD)
 
-CONFIG_PATH = SCRIPT_DIR / "tasks.json" #.json file path
 
 def append_log(text: str) -> None:
     """Append a line (or lines) to the runner log."""
-    with LOG_FILE.open("a", encoding="utf-8") as fh:
-        fh.write(text)
+    global _LOG_FD
+    if _LOG_FD is None:
+        log_file = _paths()[2]
+        _LOG_FD = os.open(str(log_file), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        atexit.register(_close_log)
+    _LOG_BUF.extend(text.encode("utf-8"))
+    if len(_LOG_BUF) >= _LOG_FLUSH_AT:
+        _flush_log()
 
 
 def ts() -> str:
     """Timestamp string for log lines."""
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    # time.strftime formats at C level without allocating a datetime object,
+    # which matters because this runs on every START/retry/SUCCESS/FAIL line.
+    return time.strftime("%Y-%m-%d %H:%M:%S")
 
 
 # --------------------------------------------------------------------------------------
 # Decorator: logging + retry wrapper
 # --------------------------------------------------------------------------------------
 
+# Log-line templates, built once. For these simple substitutions the C-level
+# % formatter is cheaper than an f-string's per-value FORMAT_VALUE dispatch.
+_START_TPL = "[%s] START %s\n"
+_SUCCESS_TPL = "[%s] SUCCESS %s in %dms\n"
+_FAIL_RETRY_TPL = "[%s] FAIL %s in %dms (%s: %s)\n"
+_FAIL_TPL = "[%s] FAIL %s in %dms\n%s\n"
+_RETRY_TPL = "[%s] Retrying %s... (%d/%d)\n"
+
+
 def with_logging_and_retry(max_retries: int = 2) -> Callable[[Callable[..., object]], Callable[..., object]]:
     """
-    Decorator that:
+    Decorator for async task coroutines that:
       - logs START/SUCCESS/FAIL with timestamps and durations,
       - captures and logs full traceback on failure,
-      - retries the function up to `max_retries` times (so attempts = max_retries + 1).
+      - retries the coroutine up to `max_retries` times (so attempts = max_retries + 1).
     """
     def decorator(func: Callable[..., object]) -> Callable[..., object]:
         @functools.wraps(func)
-        def wrapper(*args, **kwargs):
+        async def wrapper(*args,
+                          # Bound once at decoration time: LOAD_FAST on these
+                          # is ~3x cheaper than LOAD_GLOBAL, and the wrapper
+                          # body runs for every task call and every retry.
+                          _mn=time.monotonic_ns,
+                          _ts=ts,
+                          _al=append_log,
+                          _fe=traceback.format_exc,
+                          _name=func.__name__,
+                          _verbose=_VERBOSE,
+                          **kwargs):
             attempts = 0
             while attempts <= max_retries:
-                start_label = ts()
-                t0 = time.perf_counter()
+                start_label = _ts()
+                # monotonic_ns keeps the duration as a plain int; perf_counter
+                # would allocate a float per call and cost a %.3f format.
+                t0 = _mn()
                 try:
-                    print(f"[{start_label}] START {func.__name__}")
-                    result = func(*args, **kwargs)
-                    dt = time.perf_counter() - t0
-                    append_log(f"[{start_label}] SUCCESS {func.__name__} in {dt:.3f}s\n")
+                    if _verbose:
+                        sys.stdout.write(_START_TPL % (start_label, _name))
+                    result = await func(*args, **kwargs)
+                    dt_ms = (_mn() - t0) // 1_000_000
+                    _al(_SUCCESS_TPL % (start_label, _name, dt_ms))
                     return result
-                except Exception:
-                    dt = time.perf_counter() - t0
-                    tb = traceback.format_exc()
-                    append_log(f"[{start_label}] FAIL {func.__name__} in {dt:.3f}s\n{tb}\n")
+                except Exception as exc:
+                    dt_ms = (_mn() - t0) // 1_000_000
                     attempts += 1
                     if attempts <= max_retries:
-                        retry_label = ts()
-                        msg = f"[{retry_label}] Retrying {func.__name__}... ({attempts}/{max_retries})\n"
-                        print(msg.strip())
-                        append_log(msg)
+                        # Transient failure: formatting the full traceback
+                        # walks and renders every frame, which is wasted work
+                        # if the retry succeeds. Log a compact one-liner and
+                        # keep the full traceback for terminal failure only.
+                        _al(_FAIL_RETRY_TPL % (start_label, _name, dt_ms,
+                                               type(exc).__name__, exc))
+                        # Reuse the attempt's label rather than formatting a
+                        # second timestamp; the FAIL line above already pins
+                        # down when this attempt ended.
+                        msg = _RETRY_TPL % (start_label, _name, attempts, max_retries)
+                        if _verbose:
+                            sys.stdout.write(msg)
+                        _al(msg)
+                        # Yield to the event loop so sibling tasks can progress
+                        # between retry attempts.
+                        await asyncio.sleep(0)
                     else:
+                        tb = _fe()
+                        _al(_FAIL_TPL % (start_label, _name, dt_ms, tb))
                         # Final failure: re-raise so caller can mark overall exit code
                         raise
         return wrapper
@@ -94,73 +183,148 @@ def with_logging_and_retry(max_retries: int = 2) -> Callable[[Callable[..., obje
 # One intentionally fails to exercise retry + traceback logging.
 # --------------------------------------------------------------------------------------
 
-@with_logging_and_retry(max_retries=2)
-def daily_backup() -> None:
+async def daily_backup() -> None:
     """
     Pretend to back up files somewhere.
     Replace print with real work in a real project.
     """
-    # Simulated work
-    time.sleep(0.3)
+    # Simulated work (non-blocking so independent tasks overlap)
+    await asyncio.sleep(0.3)
     print("daily_backup: Backup completed.")
 
 
-@with_logging_and_retry(max_retries=2)
-def generate_report() -> None:
+async def generate_report() -> None:
     """
     Pretend to generate a report.
     """
-    time.sleep(0.25)
+    await asyncio.sleep(0.25)
     print("generate_report: Report generated.")
 
 
-@with_logging_and_retry(max_retries=2)
-def send_email() -> None:
+async def send_email() -> None:
     """
     Intentionally fail to test retry + traceback logging.
     Comment out the exception if you want it to pass.
     """
-    time.sleep(0.2)
+    await asyncio.sleep(0.2)
     # Intentionally failing to validate retries/traceback logging:
     raise ValueError("Email server not reachable (intentional test failure).")
     # print("send_email: Email sent.")  # <- enable this and comment the raise to make it pass.
 
 
 # --------------------------------------------------------------------------------------
-# TASKS mapping: string name -> function object
+# TASKS mapping: string name -> (raw coroutine function, max_retries)
 # --------------------------------------------------------------------------------------
 
-TASKS: Dict[str, Callable[[], None]] = {
-    "daily_backup": daily_backup,
-    "generate_report": generate_report,
-    "send_email": send_email,
+# Registered tasks are stored undecorated; the logging/retry wrapper is
+# applied lazily per task on first resolution (see _task). Import then costs
+# one dict literal regardless of how many tasks are registered; wrapping
+# happens at config-load time, once per *enabled* task, so tasks that are
+# registered but not enabled in the config are never wrapped.
+TASKS: Dict[str, tuple[Callable[[], object], int]] = {
+    "daily_backup": (daily_backup, 2),
+    "generate_report": (generate_report, 2),
+    "send_email": (send_email, 2),
 }
 
 
+@functools.lru_cache(maxsize=None)
+def _task(name: str) -> Callable[[], object]:
+    """Return the wrapped callable for a registered task, wrapping once."""
+    func, max_retries = TASKS[name]
+    return with_logging_and_retry(max_retries=max_retries)(func)
+
+
 # --------------------------------------------------------------------------------------
 # Config loading & enabled-task filtering
 # --------------------------------------------------------------------------------------
 
+# Below this size, stdlib json.load beats the streaming parser's overhead.
+_STREAM_PARSE_MIN_BYTES = 64 * 1024
+
+
+def _load_py_config(py_path: Path) -> dict:
+    """
+    Load config from a tasks_config.py module declaring ENABLED, a sequence
+    of task names. CPython caches the compiled module in __pycache__, so
+    repeat invocations skip parsing entirely — the fastest config path.
+    """
+    try:
+        spec = importlib.util.spec_from_file_location("tasks_config", py_path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        names = mod.ENABLED
+    except Exception as e:
+        # Executing arbitrary Python can fail in far more ways than JSON
+        # parsing; whatever it raises, report it like any other bad config.
+        print(f"[ERROR] Invalid config module {py_path}: {e}", file=sys.stderr)
+        sys.exit(1)
+    return {"tasks": [{"name": name, "enabled": True} for name in names]}
+
+
 def load_config(path: Path) -> dict:
+    """
+    Load the task config. A tasks_config.py next to the JSON file wins (see
+    _load_py_config); otherwise load tasks.json, keeping a pickled copy next
+    to it keyed on the config's mtime. Re-parsing JSON on every CLI
+    invocation is repeated work; on a cache hit we only pay a stat plus a
+    small pickle read, which is markedly cheaper than re-tokenizing the
+    JSON text.
+    """
+    py_path = path.with_name("tasks_config.py")
+    if py_path.exists():
+        return _load_py_config(py_path)
+
     if not path.exists():
         print(f"[ERROR] Missing config file: {path}", file=sys.stderr)
         sys.exit(1)
+
+    stat = path.stat()
+    mtime_ns = stat.st_mtime_ns
+    cache_path = path.with_suffix(".cache.pickle")
+    try:
+        with cache_path.open("rb") as f:
+            cached_mtime_ns, cfg = pickle.load(f)
+        if cached_mtime_ns == mtime_ns:
+            return cfg
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        pass  # missing or corrupt cache: fall through to a full parse
+
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        with path.open("rb") as f:
+            if ijson is not None and stat.st_size > _STREAM_PARSE_MIN_BYTES:
+                # One-pass streaming parse: yield task entries as they are
+                # read and keep only the enabled ones, instead of building
+                # the whole document in memory first. Malformed (non-dict)
+                # entries pass through so get_enabled_tasks can warn about
+                # them, as it does for name validation and unknown tasks.
+                cfg = {"tasks": [item for item in ijson.items(f, "tasks.item")
+                                 if not isinstance(item, dict) or item.get("enabled")]}
+            else:
+                cfg = json.load(f)
+    except _JSON_ERRORS as e:
         print(f"[ERROR] Invalid JSON in {path}: {e}", file=sys.stderr)
         sys.exit(1)
 
+    try:
+        with cache_path.open("wb") as f:
+            pickle.dump((mtime_ns, cfg), f, protocol=5)
+    except OSError:
+        pass  # read-only config dir: caching is best-effort
+    return cfg
+
 
-def get_enabled_task_names(cfg: dict) -> list[str]:
+def get_enabled_tasks(cfg: dict) -> list[tuple[str, Callable[[], object], str]]:
     """
     Expect a JSON shape:
-      { "tasks": [ {"name": "daily_backup", "enabled": true}, ... ] }
-    Returns a list of task names that are enabled AND defined in TASKS.
-    Warns if config enables an undefined task.
+      { "tasks": [ {"name": "daily_backup", "enabled": true, "kind": "io"}, ... ] }
+    Returns (name, callable, kind) triples for tasks that are enabled AND
+    defined in TASKS. `kind` is "io" (default) or "cpu" and decides whether
+    'all' mode runs the task on the event loop or in a worker process.
+    Resolving the callables here means the runner never re-does the dict
+    lookup per task. Warns if config enables an undefined task.
     """
-    enabled: list[str] = []
+    enabled: list[tuple[str, Callable[[], object], str]] = []
     items = cfg.get("tasks", [])
     if not isinstance(items, list):
         print("[ERROR] `tasks` must be a list in tasks.json", file=sys.stderr)
@@ -175,17 +339,69 @@ def get_enabled_task_names(cfg: dict) -> list[str]:
         if not name or not enabled_flag:
             continue
         if name in TASKS:
-            enabled.append(name)
+            enabled.append((name, _task(name), item.get("kind", "io")))
         else:
             print(f"[WARN] Task '{name}' is enabled in config but not defined in code.", file=sys.stderr)
     return enabled
 
 
+@functools.lru_cache(maxsize=1)
+def _enabled_tasks_cached(path: Path, mtime_ns: int) -> tuple[tuple[str, Callable[[], object], str], ...]:
+    """Memoized parse + validation, keyed by config path and its mtime."""
+    return tuple(get_enabled_tasks(load_config(path)))
+
+
+def load_enabled_tasks(path: Path) -> list[tuple[str, Callable[[], object], str]]:
+    """
+    Stat the config and return the enabled (name, callable, kind) triples,
+    hitting the memoized parse unless the file changed. The memo is keyed on
+    the mtime of whichever source load_config will actually use — a
+    tasks_config.py if present, else the JSON file — so edits to either
+    invalidate it. A long-running or embedded runner pays parsing and
+    validation only once per config version; repeat calls cost a stat plus
+    a cache lookup.
+    """
+    py_path = path.with_name("tasks_config.py")
+    src = py_path if py_path.exists() else path
+    if not src.exists():
+        print(f"[ERROR] Missing config file: {path}", file=sys.stderr)
+        sys.exit(1)
+    return list(_enabled_tasks_cached(path, src.stat().st_mtime_ns))
+
+
 # --------------------------------------------------------------------------------------
 # Runner
 # --------------------------------------------------------------------------------------
 
-def run_tasks(request: str, enabled_names: list[str]) -> int:
+async def _run_all(io_tasks: list[Callable[[], object]]) -> bool:
+    """
+    Dispatch the I/O-bound tasks concurrently and wait for them to finish.
+    Tasks are independent and mostly waiting on I/O, so wall-clock time is
+    roughly max(task_times) rather than their sum.
+    Returns True if any task failed after exhausting its retries.
+    """
+    results = await asyncio.gather(
+        *(func() for func in io_tasks),
+        return_exceptions=True,
+    )
+    return any(isinstance(r, Exception) for r in results)
+
+
+def _run_cpu_task(name: str) -> None:
+    """
+    Worker-process entry point for CPU-bound tasks. Must stay a module-level
+    function so it pickles by reference; the task is looked up, wrapped, and
+    run in the child, where it gets its own interpreter (and GIL).
+    """
+    try:
+        asyncio.run(_task(name)())
+    finally:
+        # Fork-launched workers exit via os._exit, which skips atexit, so
+        # the child's buffered log lines must be flushed here or they're lost.
+        _flush_log()
+
+
+def run_tasks(request: str, enabled: list[tuple[str, Callable[[], object], str]]) -> int:
     """
     Run `all` enabled tasks or one specific task.
     Returns exit code: 0 if all requested succeeded, 1 otherwise.
@@ -196,35 +412,41 @@ def run_tasks(request: str, enabled_names: list[str]) -> int:
     had_failure = False
 
     if request == "all":
-        # Preserve enabled order as in config
-        for name in enabled_names:
-            func = TASKS.get(name)
-            if not func:
-                # Shouldn't happen due to pre-filtering, but guard anyway
-                print(f"[ERROR] Task '{name}' not found in TASKS.", file=sys.stderr)
-                append_log(f"[{ts()}] ERROR Task '{name}' missing in TASKS\n")
-                had_failure = True
-                continue
-            try:
-                func()  # wrapped by decorator for logging + retries
-            except Exception:
+        # Enabled order is preserved at dispatch; completion order may differ.
+        # CPU-bound tasks go to worker processes (the serial loop under the
+        # GIL cannot use multiple cores); I/O-bound tasks share the event
+        # loop. The pool is submitted first so both groups overlap.
+        io_tasks = [func for _name, func, kind in enabled if kind != "cpu"]
+        cpu_names = [name for name, _func, kind in enabled if kind == "cpu"]
+        pool = None
+        futures = []
+        if cpu_names:
+            # Flush before forking: workers inherit the parent's buffer, and
+            # any unflushed bytes (the session header) would be written a
+            # second time if a child's buffer ever crossed the threshold.
+            _flush_log()
+            pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+            futures = [pool.submit(_run_cpu_task, name) for name in cpu_names]
+        if io_tasks:
+            had_failure = asyncio.run(_run_all(io_tasks))
+        for future in futures:
+            if future.exception() is not None:
                 had_failure = True
+        if pool is not None:
+            pool.shutdown()
     else:
-        # Single task mode
-        if request not in enabled_names:
+        # Single task mode: callables were resolved at load time, so a linear
+        # scan over the handful of enabled entries is all that's left to do.
+        func = next((fn for name, fn, _kind in enabled if name == request), None)
+        if func is None:
             # Clear message showing what *is* allowed right now
-            enabled_str = ", ".join(enabled_names) if enabled_names else "(none enabled)"
+            enabled_str = ", ".join(name for name, _f, _k in enabled) if enabled else "(none enabled)"
             print(f"[ERROR] Task '{request}' is not enabled or not defined.\n"
                   f"Enabled tasks right now: {enabled_str}", file=sys.stderr)
             append_log(f"[{ts()}] ERROR Requested '{request}' not enabled/defined\n")
             return 1
-        func = TASKS.get(request)
-        if not func:
-            print(f"[ERROR] Task '{request}' not found in TASKS.", file=sys.stderr)
-            append_log(f"[{ts()}] ERROR Task '{request}' missing in TASKS\n")
-            return 1
         try:
-            func()
+            asyncio.run(func())
         except Exception:
             had_failure = True
 
@@ -236,21 +458,43 @@ def run_tasks(request: str, enabled_names: list[str]) -> int:
 # CLI
 # --------------------------------------------------------------------------------------
 
+def _lower_priority() -> None:
+    """
+    Make a background 'all' run polite: drop scheduling priority and pin the
+    process to two cores so foreground work on the host keeps getting CPU.
+    Best-effort and Unix-only; platforms without these calls are left alone.
+    """
+    if hasattr(os, "nice"):
+        try:
+            os.nice(10)
+        except OSError:
+            pass
+    if hasattr(os, "sched_setaffinity"):
+        try:
+            cores = sorted(os.sched_getaffinity(0))[:2]
+            os.sched_setaffinity(0, cores)
+        except OSError:
+            pass
+
+
 def main(argv: list[str]) -> int:
     if len(argv) != 2:
         print("Usage: python task_runner.py [all|<task_name>]", file=sys.stderr)
         return 1
 
+    # Non-interactive runs don't benefit from line-buffered stdout; let the
+    # text wrapper batch writes so task output costs fewer syscalls.
+    if not sys.stdout.isatty():
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+
     request = argv[1].strip()
-    cfg = load_config(CONFIG_PATH)
-    enabled_names = get_enabled_task_names(cfg)
+    if request == "all" and os.environ.get("TASKRUNNER_BACKGROUND") == "1":
+        _lower_priority()
 
-    if request != "all" and request not in enabled_names:
-        # we’ll let run_tasks re-check and print a nice message, but short-circuiting here is also fine
-        pass
+    enabled = load_enabled_tasks(_paths()[3])
 
     print("Starting Task Runner...\n")
-    return run_tasks(request, enabled_names)
+    return run_tasks(request, enabled)
 
 
 if __name__ == "__main__":